@@ -3,7 +3,11 @@ from __future__ import annotations
 import os
 from dotenv import load_dotenv
 
-load_dotenv()
+# Point python-dotenv straight at the project's .env: a bare load_dotenv()
+# inspects the call stack and walks up the directory tree looking for one.
+_DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+if os.path.isfile(_DOTENV_PATH):
+    load_dotenv(_DOTENV_PATH)
 
 # --- Paths ---
 # If AVATAR_FACE is missing, main.py will prompt you once.
@@ -1,9 +1,13 @@
+import argparse
 import os
+import stat
 import sys
-import uuid
-import subprocess
+import tempfile
+import threading
 import time
+import uuid
 from pathlib import Path
+from typing import Optional
 
 from config import (
     AVATAR_FACE,
@@ -18,29 +22,49 @@ from config import (
 )
 
 from src.piper_tts import speak as piper_speak
+from src.prompts import (
+    ENHANCER_CHOICES,
+    PREPROCESS_CHOICES,
+    PREPROCESS_MODES,
+    SIZE_CHOICES,
+    VOICE_CHOICES,
+    format_with_default,
+)
 
 
 PROJECT_ROOT = Path(__file__).resolve().parent
 
+# Resolved once at import; the prompts below only compare strings.
+_VOICE_MALE = os.path.expanduser(PIPER_VOICE_MALE)
+_VOICE_FEMALE = os.path.expanduser(PIPER_VOICE_FEMALE)
+_VOICE_DEFAULT_NAME = os.path.basename(os.path.expanduser(PIPER_VOICE_DEFAULT))
+
+# /dev/shm is tmpfs on Linux; elsewhere use the regular temp dir.
+_TMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
 
-def prompt_path(prompt: str) -> str:
+
+def prompt_path(prompt: str, kind: str = "file") -> str:
+    """Ask for a path until one of the requested kind ("file" or "dir") exists."""
+
+    check = os.path.isdir if kind == "dir" else os.path.isfile
     while True:
         value = input(f"{prompt}: ").strip().strip('"').strip("'")
         if value:
-            p = Path(value).expanduser()
-            if p.exists():
-                return str(p)
-            print(f"Path not found: {p}. Try again.")
+            path = os.path.expanduser(value)
+            if check(path):
+                return path
+            print(f"Not a {kind}: {path}. Try again.")
         else:
             print("Please enter a non-empty path.")
 
 
 def prompt_choice(prompt: str, choices: dict, default: str) -> str:
-    print(prompt)
-    for key, label in choices.items():
-        print(f"  {key}) {label}")
+    # Render the whole menu up front and write it in one go.
+    menu = prompt + "\n" + "".join(f"  {key}) {label}\n" for key, label in choices.items())
+    sys.stdout.write(menu)
+    select = f"Select option [{default}]: "
     while True:
-        value = input(f"Select option [{default}]: ").strip()
+        value = input(select).strip()
         if not value:
             return default
         if value in choices:
@@ -48,6 +72,44 @@ def prompt_choice(prompt: str, choices: dict, default: str) -> str:
         print("Invalid choice, try again.")
 
 
+def _check_file(path: str) -> Optional[os.stat_result]:
+    """Stat `path` once; None unless it is an accessible regular file."""
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st if stat.S_ISREG(st.st_mode) else None
+
+
+def _find_latest_mp4(root: str) -> Optional[str]:
+    """Return the newest .mp4 under `root`, using one os.scandir pass."""
+
+    best_mtime, best_path = -1.0, None
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".mp4"):
+                    mtime = entry.stat().st_mtime
+                    if mtime > best_mtime:
+                        best_mtime, best_path = mtime, entry.path
+    return best_path
+
+
+def _warm_up_sadtalker(cfg: argparse.Namespace, errors: list) -> None:
+    """Import SadTalker and load its models; failures are appended to `errors`."""
+
+    try:
+        from src import inference as sadtalker
+
+        sadtalker.preload_models(cfg)
+    except Exception as exc:
+        errors.append(exc)
+
+
 def main() -> None:
     print("=== SadTalker CLI (Piper TTS -> SadTalker) ===")
     print(f"Working directory: {PROJECT_ROOT}")
@@ -60,28 +122,20 @@ def main() -> None:
         print("Please type a non-empty message.")
 
     # 2) Choose Piper voice (Enter = default from config)
-    piper_default_choice = "2"
-    try:
-        default_name = Path(PIPER_VOICE_DEFAULT).expanduser().name
-        if default_name == Path(PIPER_VOICE_MALE).expanduser().name:
-            piper_default_choice = "1"
-        elif default_name == Path(PIPER_VOICE_FEMALE).expanduser().name:
-            piper_default_choice = "2"
-    except Exception:
-        piper_default_choice = "2"
-
-    voice_choices = {
-        "1": "Male (Tuga)" + (" [default]" if piper_default_choice == "1" else ""),
-        "2": "Female (Dii)" + (" [default]" if piper_default_choice == "2" else ""),
-    }
-    voice_choice = prompt_choice("Choose Piper voice", voice_choices, default=piper_default_choice)
-    voice_model = PIPER_VOICE_MALE if voice_choice == "1" else PIPER_VOICE_FEMALE
+    piper_default_choice = "1" if _VOICE_DEFAULT_NAME == os.path.basename(_VOICE_MALE) else "2"
+
+    voice_choice = prompt_choice(
+        "Choose Piper voice",
+        format_with_default(VOICE_CHOICES, piper_default_choice),
+        default=piper_default_choice,
+    )
+    voice_model = _VOICE_MALE if voice_choice == "1" else _VOICE_FEMALE
 
     # 3) Avatar image (auto-fill from config)
-    avatar_path = AVATAR_FACE
-    if not Path(avatar_path).expanduser().exists():
+    avatar_path = os.path.expanduser(AVATAR_FACE)
+    if _check_file(avatar_path) is None:
         print(f"Default avatar not found at: {avatar_path}")
-        avatar_path = prompt_path("Enter avatar image path (png/jpg)")
+        avatar_path = prompt_path("Enter avatar image path (png/jpg)", kind="file")
 
     # 4) SadTalker settings (Enter = defaults from config)
     preprocess_default_choice = (
@@ -89,38 +143,27 @@ def main() -> None:
         if SADTALKER_PREPROCESS_DEFAULT == "crop"
         else ("2" if SADTALKER_PREPROCESS_DEFAULT == "full" else "3")
     )
-    preprocess_choices = {
-        "1": "crop   (portrait / face crop)" + (" [default]" if preprocess_default_choice == "1" else ""),
-        "2": "full   (full image)" + (" [default]" if preprocess_default_choice == "2" else ""),
-        "3": "extfull (full image, extended crop)" + (" [default]" if preprocess_default_choice == "3" else ""),
-    }
     preprocess_choice = prompt_choice(
         "Choose image preprocessing mode",
-        preprocess_choices,
+        format_with_default(PREPROCESS_CHOICES, preprocess_default_choice),
         default=preprocess_default_choice,
     )
+    preprocess = PREPROCESS_MODES[preprocess_choice]
 
-    if preprocess_choice == "1":
-        preprocess = "crop"
-    elif preprocess_choice == "2":
-        preprocess = "full"
-    else:
-        preprocess = "extfull"
-
-    size_default_choice = SADTALKER_SIZE_DEFAULT if SADTALKER_SIZE_DEFAULT in {"256", "512"} else "256"
-    size_choices = {
-        "256": "256x256 (faster, less memory)" + (" [default]" if size_default_choice == "256" else ""),
-        "512": "512x512 (slower, more memory)" + (" [default]" if size_default_choice == "512" else ""),
-    }
-    size_choice = prompt_choice("Choose output resolution", size_choices, default=size_default_choice)
+    size_default_choice = SADTALKER_SIZE_DEFAULT if SADTALKER_SIZE_DEFAULT in SIZE_CHOICES else "256"
+    size_choice = prompt_choice(
+        "Choose output resolution",
+        format_with_default(SIZE_CHOICES, size_default_choice),
+        default=size_default_choice,
+    )
     size = size_choice
 
     enhancer_default_choice = "2" if SADTALKER_ENHANCER_DEFAULT == "gfpgan" else "1"
-    enhancer_choices = {
-        "1": "No enhancer" + (" [default]" if enhancer_default_choice == "1" else ""),
-        "2": "Yes, GFPGAN" + (" [default]" if enhancer_default_choice == "2" else ""),
-    }
-    enhancer_choice = prompt_choice("Use face enhancer (GFPGAN)?", enhancer_choices, default=enhancer_default_choice)
+    enhancer_choice = prompt_choice(
+        "Use face enhancer (GFPGAN)?",
+        format_with_default(ENHANCER_CHOICES, enhancer_default_choice),
+        default=enhancer_default_choice,
+    )
     enhancer = "gfpgan" if enhancer_choice == "2" else None
 
     batch_default = SADTALKER_BATCH_SIZE_DEFAULT if str(SADTALKER_BATCH_SIZE_DEFAULT).isdigit() else "1"
@@ -146,51 +189,62 @@ def main() -> None:
     save_dir = result_dir / timestamp
     save_dir.mkdir(parents=True, exist_ok=True)
 
-    # 5) Generate wav via Piper inside the generated save_dir so it is
-    # cleaned up with the other intermediate files.
-    wav_path = str(save_dir / "piper.wav")
-    if not Path(voice_model).exists():
+    # 5) Generate wav via Piper in a memory-backed temp dir where available;
+    # SadTalker reads it straight back, so it never needs to reach the disk.
+    wav_path = os.path.join(_TMP_DIR, f"piper_{run_id}.wav")
+    if _check_file(voice_model) is None:
         raise FileNotFoundError(
             f"Piper voice model not found: {voice_model}\n"
             "Run: python setup.py --models-only, or place the .onnx under models/voices/"
         )
-    piper_speak(text, wav_path, voice_model)
-
-    cmd = [
-        sys.executable,
-        "-m",
-        "src.inference",
-        "--driven_audio",
-        str(wav_path),
-        "--source_image",
-        str(avatar_path),
-        "--result_dir",
-        str(result_dir),
-        "--save_dir",
-        str(save_dir),
-        "--size",
-        size,
-        "--batch_size",
-        batch_size,
-        "--preprocess",
-        preprocess,
-    ]
-
-    if still:
-        cmd.append("--still")
-
-    if enhancer:
-        cmd.extend(["--enhancer", enhancer])
-
-    print("\nRunning SadTalker:")
-    print(" ", " ".join(cmd))
-    print()
-
-    subprocess.check_call(cmd, cwd=str(PROJECT_ROOT))
-
-    mp4_files = sorted(result_dir.rglob("*.mp4"), key=os.path.getmtime)
-    if mp4_files:
-        print(f"\nDone. Generated video: {mp4_files[-1]}")
+
+    cfg = argparse.Namespace(
+        driven_audio=wav_path,
+        source_image=os.path.abspath(avatar_path),
+        result_dir=str(result_dir),
+        save_dir=str(save_dir),
+        size=int(size),
+        batch_size=int(batch_size),
+        preprocess=preprocess,
+        still=still,
+        enhancer=enhancer,
+    )
+    voice_model = os.path.abspath(voice_model)
+
+    # SadTalker resolves its checkpoints relative to the project root.
+    os.chdir(PROJECT_ROOT)
+
+    # Load SadTalker's models in the background while Piper synthesizes the
+    # audio; the two are independent until SadTalker reads the wav.
+    warm_up_errors: list = []
+    warm_up = threading.Thread(target=_warm_up_sadtalker, args=(cfg, warm_up_errors), daemon=True)
+    warm_up.start()
+
+    try:
+        piper_speak(text, wav_path, voice_model)
+
+        print("\nRunning SadTalker:")
+        for key, value in vars(cfg).items():
+            print(f"  {key}: {value}")
+        print()
+
+        warm_up.join()
+        if warm_up_errors:
+            # Surface the real cause instead of letting run() repeat the load.
+            raise RuntimeError("Loading SadTalker models failed") from warm_up_errors[0]
+
+        # Run SadTalker in this process instead of spawning `python -m src.inference`,
+        # which saves a second interpreter start-up plus the torch import.
+        from src import inference as sadtalker
+
+        sadtalker.run(cfg)
+    finally:
+        if os.path.exists(wav_path):
+            os.unlink(wav_path)
+
+    latest_mp4 = _find_latest_mp4(str(result_dir))
+    if latest_mp4:
+        print(f"\nDone. Generated video: {latest_mp4}")
     else:
         print(f"\nDone, but no mp4 found under {result_dir}. Check the results/ folder.")
 
@@ -12,12 +12,89 @@ Usage:
   python setup.py --verify
 """
 
+import json
+import os
 import sys
 import subprocess
 import shutil
+import threading
+import time
 from pathlib import Path
 from typing import Iterable, Tuple, Optional
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _log(message: str) -> None:
+    """Print `message` with a single write so parallel downloads don't interleave."""
+
+    print(message + "\n", end="", flush=True)
+
+
+def _fadvise(fd: int, advice_name: str) -> None:
+    """Best-effort posix_fadvise over the whole file; no-op where unsupported."""
+
+    advice = getattr(os, advice_name, None)
+    if advice is None:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+
+def _drop_page_cache(f) -> None:
+    """Flush a freshly written file to disk and drop its pages from the cache.
+
+    DONTNEED only evicts clean pages, so the data is synced first. Skipped
+    entirely where posix_fadvise is unavailable (macOS, Windows).
+    """
+
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        f.flush()
+        os.fdatasync(f.fileno())
+    except OSError:
+        # e.g. EINVAL on some network/FUSE mounts; this is only a hint.
+        return
+    _fadvise(f.fileno(), "POSIX_FADV_DONTNEED")
+
+
+class _DownloadCancelled(Exception):
+    """Raised inside a download worker once the user has hit Ctrl+C."""
+
+
+class _ProgressReader:
+    """File-like wrapper that reports download progress every few MB.
+
+    Downloads run in parallel, so progress is printed as whole lines at
+    coarse steps instead of redrawing a single progress bar.
+    """
+
+    report_every = 16 << 20
+
+    def __init__(self, raw, name: str, total: int, downloaded: int = 0, cancel: Optional[threading.Event] = None) -> None:
+        self.raw = raw
+        self.name = name
+        self.total = total
+        self.downloaded = downloaded
+        self.last_report = downloaded
+        self.cancel = cancel
+
+    def read(self, size: int = -1) -> bytes:
+        if self.cancel is not None and self.cancel.is_set():
+            raise _DownloadCancelled()
+        # read1 returns what is already buffered instead of blocking until a
+        # full chunk has arrived, so cancellation is noticed promptly.
+        chunk = self.raw.read1(size) if hasattr(self.raw, "read1") else self.raw.read(size)
+        self.downloaded += len(chunk)
+        if self.total and self.downloaded - self.last_report >= self.report_every:
+            self.last_report = self.downloaded
+            percent = self.downloaded * 100.0 / self.total
+            _log(f"  {self.name}: {percent:5.1f}%")
+        return chunk
 
 
 class SadTalkerSetup:
@@ -27,6 +104,12 @@ class SadTalkerSetup:
         self.checkpoints_dir = models_root / "checkpoints"
         self.gfpgan_weights_dir = models_root / "gfpgan" / "weights"
         self.piper_voices_dir = models_root / "voices"
+        self.download_workers = 4
+        # Set on Ctrl+C so in-flight downloads stop instead of running to completion.
+        self._cancel = threading.Event()
+        # Small JSON cache for facts that are slow to recompute (e.g. tool paths).
+        self.cache_file = self.project_root / ".sadtalker_cache.json"
+        self.cache_max_age = 24 * 60 * 60
 
     # --- helpers ---------------------------------------------------------
 
@@ -57,6 +140,19 @@ class SadTalkerSetup:
             print(f"Error running command '{cmd}': {exc}")
             return False
 
+    def _load_cache(self) -> dict:
+        try:
+            data = json.loads(self.cache_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_cache(self, data: dict) -> None:
+        try:
+            self.cache_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        except OSError as exc:
+            print(f"Warning: could not write {self.cache_file.name}: {exc}")
+
     # --- steps -----------------------------------------------------------
 
     def check_python_version(self) -> bool:
@@ -71,8 +167,21 @@ class SadTalkerSetup:
         return True
 
     def check_system_tools(self) -> None:
-        """Check for required system tools like ffmpeg and warn if missing."""
-        if shutil.which("ffmpeg") is None:
+        """Check for required system tools like ffmpeg and warn if missing.
+
+        The resolved ffmpeg path is cached for a day so repeated runs skip the
+        $PATH walk in shutil.which().
+        """
+        data = self._load_cache()
+        ffmpeg = data.get("ffmpeg")
+        fresh = time.time() - data.get("ffmpeg_checked_at", 0) < self.cache_max_age
+        if not (fresh and ffmpeg and os.path.exists(ffmpeg)):
+            ffmpeg = shutil.which("ffmpeg")
+            data["ffmpeg"] = ffmpeg
+            data["ffmpeg_checked_at"] = time.time()
+            self._save_cache(data)
+
+        if ffmpeg is None:
             print("Warning: ffmpeg not found in PATH. Video writing may fail.")
             print("         On macOS you can install it with: brew install ffmpeg")
 
@@ -90,85 +199,109 @@ class SadTalkerSetup:
         ok = self.run_command("pip install -r requirements.txt", "Installing requirements")
         if ok:
             print("Requirements installed successfully.")
-            # After installing, patch the local gfpgan package so that
-            # its internal FaceRestoreHelper stores detection/parsing
-            # weights under models/gfpgan/weights instead of a root
-            # gfpgan/weights folder.
-            self.patch_gfpgan_paths()
         return ok
 
-    def patch_gfpgan_paths(self) -> None:
-        """Best-effort patch of gfpgan.utils to honor models/ layout.
-
-        This edits the installed gfpgan package in the current environment
-        so that FaceRestoreHelper uses models/gfpgan/weights as its
-        model_rootpath. If anything goes wrong, it just logs and continues.
-        """
-        try:
-            import importlib
-
-            gfpgan_spec = importlib.util.find_spec("gfpgan")
-            if gfpgan_spec is None or not gfpgan_spec.origin:
-                return
-
-            utils_path = Path(gfpgan_spec.origin).with_name("utils.py")
-            if not utils_path.exists():
-                return
-
-            text = utils_path.read_text(encoding="utf-8")
-            old = "model_rootpath='gfpgan/weights'"
-            new = "model_rootpath='models/gfpgan/weights'"
-            if old not in text:
-                return
-
-            utils_path.write_text(text.replace(old, new), encoding="utf-8")
-            print(f"Patched gfpgan utils to use models/gfpgan/weights: {utils_path}")
-        except Exception as exc:
-            print(f"Warning: could not patch gfpgan paths automatically: {exc}")
-
     def _download_file(self, url: str, dest: Path) -> bool:
         dest.parent.mkdir(parents=True, exist_ok=True)
 
-        if dest.exists():
-            size_mb = dest.stat().st_size // (1024 * 1024)
-            print(f"Already exists ({size_mb} MB): {dest}")
-            return True
+        # Download into a side file and only move it into place once complete,
+        # so an interrupted run can be resumed with an HTTP Range request.
+        part = dest.with_name(dest.name + ".part")
 
-        print(f"Downloading:\n  URL : {url}\n  Dest: {dest}")
+        if dest.exists():
+            size = dest.stat().st_size
+            remote = self._remote_size(url)
+            if remote is None or remote == size:
+                _log(f"Already exists ({size // (1024 * 1024)} MB): {dest}")
+                return True
+            # A torn file from an older, non-atomic download, or a different
+            # version of the asset. Nothing proves it is a prefix of the remote
+            # file, so start over rather than append to it.
+            _log(f"Size mismatch for {dest} ({size} bytes locally, {remote} remote); downloading again.")
+            dest.unlink()
+        existing = part.stat().st_size if part.exists() else 0
+        headers = {"Range": f"bytes={existing}-"} if existing else {}
+
+        if existing:
+            _log(f"Resuming at {existing // (1024 * 1024)} MB:\n  URL : {url}\n  Dest: {dest}")
+        else:
+            _log(f"Downloading:\n  URL : {url}\n  Dest: {dest}")
         try:
-            with urllib.request.urlopen(url) as resp:
-                total = resp.length or 0
-                downloaded = 0
-                chunk_size = 8192
-
-                with open(dest, "wb") as f:
-                    while True:
-                        chunk = resp.read(chunk_size)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total:
-                            percent = downloaded * 100.0 / total
-                            bar_len = 30
-                            filled = int(bar_len * percent / 100.0)
-                            bar = "#" * filled + "-" * (bar_len - filled)
-                            print(f"\r  [{bar}] {percent:5.1f}%", end="", flush=True)
-                if total:
-                    print()
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=60) as resp:
+                # 206 means the server honoured the Range header; anything else
+                # is the full body, so start the part file over.
+                if resp.status != 206:
+                    existing = 0
+                total = existing + (resp.length or 0)
+                reader = _ProgressReader(resp, dest.name, total, existing, self._cancel)
+
+                with open(part, "ab" if existing else "wb") as f:
+                    _fadvise(f.fileno(), "POSIX_FADV_SEQUENTIAL")
+                    shutil.copyfileobj(reader, f, length=1 << 20)
+                    # Checkpoints are hundreds of MB and only read again at
+                    # inference time; don't let them push more useful pages
+                    # out of the page cache.
+                    _drop_page_cache(f)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 416 and existing:
+                # The part file already holds the whole body.
+                os.replace(part, dest)
+                _log(f"Downloaded {dest} ({existing // (1024 * 1024)} MB)")
+                return True
+            _log(f"Failed to download {url}: {exc}")
+            return False
+        except _DownloadCancelled:
+            _log(f"Cancelled {dest.name}; partial data kept in {part} for the next run.")
+            return False
         except Exception as exc:
-            print(f"Failed to download {url}: {exc}")
-            if dest.exists():
-                try:
-                    dest.unlink()
-                except OSError:
-                    pass
+            message = f"Failed to download {url}: {exc}"
+            if part.exists():
+                message += f"\n  Partial data kept in {part}; re-run to resume."
+            _log(message)
             return False
 
+        os.replace(part, dest)
         size_mb = dest.stat().st_size // (1024 * 1024)
-        print(f"Downloaded {dest} ({size_mb} MB)")
+        _log(f"Downloaded {dest} ({size_mb} MB)")
         return True
 
+    def _remote_size(self, url: str) -> Optional[int]:
+        """Total size of `url` in bytes, or None if it cannot be determined.
+
+        Asks for a single byte rather than sending HEAD: every model URL
+        redirects, and urllib turns a redirected HEAD into a full GET.
+        """
+
+        try:
+            req = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                if resp.status == 206:
+                    # Content-Range: bytes 0-0/<total>
+                    length = resp.headers.get("Content-Range", "").rpartition("/")[2]
+                else:
+                    length = resp.headers.get("Content-Length")
+        except Exception:
+            return None
+        return int(length) if length and length.isdigit() else None
+
+    def _download_all(self, items: Iterable[Tuple[str, Path]]) -> bool:
+        """Download several files concurrently; True only if all succeeded."""
+
+        self._cancel.clear()
+        with ThreadPoolExecutor(max_workers=self.download_workers) as pool:
+            futures = [pool.submit(self._download_file, url, dest) for url, dest in items]
+            try:
+                results = [future.result() for future in futures]
+            except KeyboardInterrupt:
+                # The pool waits for running workers on exit; make them stop
+                # at their next read instead of finishing their files.
+                self._cancel.set()
+                for future in futures:
+                    future.cancel()
+                raise
+        return all(results)
+
     def download_models(self) -> bool:
         self.print_header("Downloading SadTalker checkpoints and enhancer weights")
 
@@ -211,10 +344,7 @@ class SadTalkerSetup:
             ),
         ]
 
-        all_ok = True
-        for url, dest in list(checkpoint_urls) + list(enhancer_urls):
-            if not self._download_file(url, dest):
-                all_ok = False
+        all_ok = self._download_all(list(checkpoint_urls) + list(enhancer_urls))
 
         if all_ok:
             print("All model files downloaded or already present.")
@@ -256,13 +386,13 @@ class SadTalkerSetup:
         )
         dii_onnx_url = "https://huggingface.co/OpenVoiceOS/phoonnx_pt-PT_dii_tugaphone/resolve/main/dii_pt-PT.onnx?download=true"
 
-        ok = True
-        if not self._download_file(tuga_onnx_url, tuga_onnx):
-            ok = False
-        if not self._download_file(tuga_json_url, tuga_json):
-            ok = False
-        if not self._download_file(dii_onnx_url, dii_onnx):
-            ok = False
+        ok = self._download_all(
+            [
+                (tuga_onnx_url, tuga_onnx),
+                (tuga_json_url, tuga_json),
+                (dii_onnx_url, dii_onnx),
+            ]
+        )
 
         # Duplicate Tuga JSON for Dii voice config (legacy behavior)
         if tuga_json.exists() and not dii_json.exists():
@@ -311,12 +441,16 @@ class SadTalkerSetup:
         ]
         for f in key_files:
             label = f.name
-            if f.exists():
-                size_mb = f.stat().st_size // (1024 * 1024)
-                print(f"✅ {label} ({size_mb} MB)")
-            else:
+            # One stat per file gives both existence and size.
+            try:
+                st = f.stat()
+            except OSError:
                 print(f"❌ {label} not found at {f}")
                 ok = False
+                continue
+
+            size_mb = st.st_size // (1024 * 1024)
+            print(f"✅ {label} ({size_mb} MB)")
 
         return ok
 
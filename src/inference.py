@@ -1,7 +1,8 @@
 import os
 import shutil
 import sys
-from argparse import ArgumentParser
+import threading
+from argparse import ArgumentParser, Namespace
 from pathlib import Path
 from time import strftime
 
@@ -30,6 +31,33 @@ def _print_stage_progress(stage: int, total: int, label: str) -> None:
     print(f"[{bar}] {percent:5.1f}% - {label}")
 
 
+# Models built by preload_models()/main(), keyed by everything that affects them.
+_models = {}
+_models_lock = threading.Lock()
+
+
+def _load_models(args):
+    """Return (preprocess, audio2coeff, animate) models for `args`, loading once."""
+
+    key = (args.checkpoint_dir, args.size, args.old_version, args.preprocess, args.device)
+    with _models_lock:
+        if key not in _models:
+            config_dir = str(Path(__file__).resolve().parent / "config")
+            sadtalker_paths = init_path(
+                args.checkpoint_dir,
+                config_dir,
+                args.size,
+                args.old_version,
+                args.preprocess,
+            )
+            _models[key] = (
+                CropAndExtract(sadtalker_paths, args.device),
+                Audio2Coeff(sadtalker_paths, args.device),
+                AnimateFromCoeff(sadtalker_paths, args.device),
+            )
+        return _models[key]
+
+
 def main(args) -> None:
     pic_path = args.source_image
     audio_path = args.driven_audio
@@ -49,20 +77,7 @@ def main(args) -> None:
     ref_eyeblink = args.ref_eyeblink
     ref_pose = args.ref_pose
 
-    project_root = Path(__file__).resolve().parents[1]
-    config_dir = str(Path(__file__).resolve().parent / "config")
-
-    sadtalker_paths = init_path(
-        args.checkpoint_dir,
-        config_dir,
-        args.size,
-        args.old_version,
-        args.preprocess,
-    )
-
-    preprocess_model = CropAndExtract(sadtalker_paths, device)
-    audio_to_coeff = Audio2Coeff(sadtalker_paths, device)
-    animate_from_coeff = AnimateFromCoeff(sadtalker_paths, device)
+    preprocess_model, audio_to_coeff, animate_from_coeff = _load_models(args)
 
     first_frame_dir = os.path.join(save_dir, "first_frame_dir")
     os.makedirs(first_frame_dir, exist_ok=True)
@@ -219,6 +234,35 @@ def _select_device(args) -> None:
         args.device = "cpu"
 
 
+def run(cfg: Namespace) -> None:
+    """Run SadTalker in-process from an already-parsed namespace.
+
+    `cfg` only needs the fields the caller cares about (e.g. driven_audio,
+    source_image, size); every other option falls back to the CLI default.
+    This lets callers such as main.py skip spawning `python -m src.inference`
+    and re-importing torch for every run.
+    """
+
+    main(_resolve_args(cfg))
+
+
+def preload_models(cfg: Namespace) -> None:
+    """Load the models `run(cfg)` will need, e.g. from a background thread.
+
+    A later run() with the same settings reuses them (waiting for a load that
+    is still in progress) instead of reading the checkpoints again.
+    """
+
+    _load_models(_resolve_args(cfg))
+
+
+def _resolve_args(cfg: Namespace) -> Namespace:
+    args = build_arg_parser().parse_args([])
+    vars(args).update(vars(cfg))
+    _select_device(args)
+    return args
+
+
 if __name__ == "__main__":
     parser = build_arg_parser()
     args = parser.parse_args()
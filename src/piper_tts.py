@@ -1,18 +1,147 @@
 from __future__ import annotations
 
+import atexit
+import functools
+import json
 import os
+import shutil
 import subprocess
+import tempfile
+import wave
 from typing import Optional
 
+try:
+    from piper import PiperVoice
+except ImportError:  # pragma: no cover - depends on the installed piper-tts
+    PiperVoice = None
+
+
+@functools.lru_cache(maxsize=4)
+def _load(voice_model: str) -> "PiperVoice":
+    """Load (and keep) a Piper voice so repeated calls skip the ONNX session init."""
+
+    return PiperVoice.load(voice_model)
+
+
+def _speak_in_process(text: str, output_wav_path: str, voice_model: str) -> None:
+    voice = _load(voice_model)
+    with wave.open(output_wav_path, "wb") as wav_file:
+        # piper-tts >= 1.3 renamed the wave-writing helper to synthesize_wav().
+        if hasattr(voice, "synthesize_wav"):
+            voice.synthesize_wav(text, wav_file)
+        else:
+            voice.synthesize(text, wav_file)
+
+
+@functools.lru_cache(maxsize=1)
+def _piper_executable() -> str:
+    # An absolute path (plus close_fds=False and no cwd/preexec_fn) lets
+    # subprocess use posix_spawn/vfork instead of fork(), which matters once
+    # torch has been imported into this process.
+    return shutil.which("piper") or "piper"
+
+
+def _speak_cli(text: str, output_wav_path: str, voice_model: str, extra_args: Optional[list[str]]) -> None:
+    cmd = [_piper_executable(), "-m", voice_model, "-t", text, "-f", output_wav_path]
+    if extra_args:
+        cmd.extend(extra_args)
+
+    result = subprocess.run(cmd, capture_output=True, text=True, close_fds=False)
+    if result.returncode != 0:
+        raise RuntimeError(
+            "Piper failed. "
+            f"Command: {' '.join(cmd)}\n"
+            f"stderr: {result.stderr.strip()}"
+        )
+
+
+class PiperSession:
+    """A long-lived `piper` CLI process that synthesizes one utterance per line.
+
+    Used when the piper Python package is not importable (i.e. only the
+    standalone piper binary is installed), so the voice model is loaded once
+    per session instead of once per utterance. Requests are sent with
+    `--json-input`; piper answers each one with the written file path on
+    stdout.
+    """
+
+    def __init__(self, voice_model: str) -> None:
+        self.voice_model = voice_model
+        # stderr goes to a file rather than a pipe so piper's logging can never
+        # fill the pipe buffer and block it.
+        self._stderr = tempfile.TemporaryFile(mode="w+")
+        self.proc = subprocess.Popen(
+            [_piper_executable(), "-m", voice_model, "--json-input"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            text=True,
+            bufsize=1,
+            close_fds=False,
+        )
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def speak(self, text: str, output_wav_path: str) -> None:
+        request = {"text": text, "output_file": os.path.abspath(output_wav_path)}
+        try:
+            self.proc.stdin.write(json.dumps(request) + "\n")
+            self.proc.stdin.flush()
+            reply = self.proc.stdout.readline()
+        except OSError:
+            reply = ""
+        if not reply:
+            self._stderr.seek(0)
+            raise RuntimeError(
+                "Piper failed. "
+                f"Voice: {self.voice_model}\n"
+                f"stderr: {self._stderr.read().strip()}"
+            )
+
+    def close(self) -> None:
+        if self.alive():
+            self.proc.stdin.close()
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self._stderr.close()
+
+
+_sessions: dict[str, PiperSession] = {}
+
+
+def _get_session(voice_model: str) -> PiperSession:
+    session = _sessions.get(voice_model)
+    if session is None or not session.alive():
+        if session is not None:
+            session.close()
+        session = _sessions[voice_model] = PiperSession(voice_model)
+    return session
+
+
+@atexit.register
+def _close_sessions() -> None:
+    for session in _sessions.values():
+        session.close()
+    _sessions.clear()
+
 
 def speak(text: str, output_wav_path: str, voice_model: str, *, extra_args: Optional[list[str]] = None) -> str:
-    """Generate speech audio using the `piper` CLI.
+    """Generate speech audio with Piper.
+
+    Uses the `piper` Python API when it is importable (the loaded voice is
+    cached, so only the first call pays for the model load). Otherwise it
+    falls back to a persistent `piper` CLI process per voice (PiperSession).
 
     Args:
         text: Text to synthesize.
         output_wav_path: Absolute or relative path to write the WAV file.
         voice_model: Path to the Piper .onnx model.
-        extra_args: Optional extra args passed to piper.
+        extra_args: Optional extra args passed to the piper CLI. Forces a
+            one-off piper process, since they have no in-process equivalent.
 
     Returns:
         The output_wav_path.
@@ -22,17 +151,12 @@ def speak(text: str, output_wav_path: str, voice_model: str, *, extra_args: Opti
     if out_dir:
         os.makedirs(out_dir, exist_ok=True)
 
-    cmd = ["piper", "-m", voice_model, "-t", text, "-f", output_wav_path]
     if extra_args:
-        cmd.extend(extra_args)
-
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(
-            "Piper failed. "
-            f"Command: {' '.join(cmd)}\n"
-            f"stderr: {result.stderr.strip()}"
-        )
+        _speak_cli(text, output_wav_path, voice_model, extra_args)
+    elif PiperVoice is not None:
+        _speak_in_process(text, output_wav_path, voice_model)
+    else:
+        _get_session(voice_model).speak(text, output_wav_path)
 
     if not os.path.exists(output_wav_path) or os.path.getsize(output_wav_path) == 0:
         raise RuntimeError(f"Empty audio file generated: {output_wav_path}")
@@ -0,0 +1,52 @@
+"""Menu choices for the interactive CLI (main.py).
+
+Built once at import as read-only mappings; `format_with_default` adds the
+"[default]" marker for whichever key the config selects.
+"""
+
+from types import MappingProxyType
+from typing import Dict, Mapping
+
+VOICE_CHOICES: Mapping[str, str] = MappingProxyType(
+    {
+        "1": "Male (Tuga)",
+        "2": "Female (Dii)",
+    }
+)
+
+PREPROCESS_CHOICES: Mapping[str, str] = MappingProxyType(
+    {
+        "1": "crop   (portrait / face crop)",
+        "2": "full   (full image)",
+        "3": "extfull (full image, extended crop)",
+    }
+)
+
+# Menu key -> SadTalker --preprocess value.
+PREPROCESS_MODES: Mapping[str, str] = MappingProxyType(
+    {
+        "1": "crop",
+        "2": "full",
+        "3": "extfull",
+    }
+)
+
+SIZE_CHOICES: Mapping[str, str] = MappingProxyType(
+    {
+        "256": "256x256 (faster, less memory)",
+        "512": "512x512 (slower, more memory)",
+    }
+)
+
+ENHANCER_CHOICES: Mapping[str, str] = MappingProxyType(
+    {
+        "1": "No enhancer",
+        "2": "Yes, GFPGAN",
+    }
+)
+
+
+def format_with_default(choices: Mapping[str, str], default_key: str) -> Dict[str, str]:
+    """Return the menu labels with " [default]" appended to `default_key`."""
+
+    return {key: label + (" [default]" if key == default_key else "") for key, label in choices.items()}
@@ -1,6 +1,7 @@
 import os
 import torch 
 
+import gfpgan.utils
 from gfpgan import GFPGANer
 
 from tqdm import tqdm
@@ -10,6 +11,25 @@ from src.utils.videoio import load_video_to_cv2
 import cv2
 
 
+class _FaceRestoreHelper(gfpgan.utils.FaceRestoreHelper):
+    """ GFPGANer hardcodes model_rootpath='gfpgan/weights' for the facexlib
+    detection/parsing weights; keep them under models/gfpgan/weights instead. """
+
+    _sadtalker_patched = True
+
+    def __init__(self, *args, **kwargs):
+        if kwargs.get('model_rootpath') in (None, 'gfpgan/weights'):
+            kwargs['model_rootpath'] = os.path.join('models', 'gfpgan', 'weights')
+        super().__init__(*args, **kwargs)
+
+
+# GFPGANer looks FaceRestoreHelper up in gfpgan.utils, so swapping the name
+# there redirects it without editing the installed package. Skip it when the
+# name already points at a patched helper (e.g. this module was reloaded).
+if not getattr(gfpgan.utils.FaceRestoreHelper, '_sadtalker_patched', False):
+    gfpgan.utils.FaceRestoreHelper = _FaceRestoreHelper
+
+
 class GeneratorWithLen(object):
     """ From https://stackoverflow.com/a/7460929 """
 